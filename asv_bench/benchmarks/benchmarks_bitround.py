@@ -37,11 +37,11 @@ class Base:
 
     def time_jl_bitround(self, **kwargs):
         """Take time for `jl_bitround`."""
-        ensure_loaded(jl_bitround(self.ds, self.keepbits, **kwargs))
+        ensure_loaded(jl_bitround(self.ds, self.keepbits, use_julia=True, **kwargs))
 
     def peakmem_jl_bitround(self, **kwargs):
         """Take memory peak for `jl_bitround`."""
-        ensure_loaded(jl_bitround(self.ds, self.keepbits, **kwargs))
+        ensure_loaded(jl_bitround(self.ds, self.keepbits, use_julia=True, **kwargs))
 
     peakmem_jl_bitround.setup = _skip_julia
     time_jl_bitround.setup = _skip_julia
@@ -8,6 +8,7 @@ import xarray as xr
 from xarray.tutorial import load_dataset
 
 import xbitinfo as xb
+from tests import requires_numba
 
 xr.set_options(display_style="text")
 
@@ -35,6 +36,13 @@ def pytest_sessionfinish(session):
     shutil.rmtree("./tmp_testdir")
 
 
+@pytest.fixture(params=[pytest.param(True, marks=requires_numba), False])
+def numba_installed(request, monkeypatch):
+    """bitround with the numba kernels and with the numpy fallback"""
+    monkeypatch.setattr(xb.bitround, "numba_installed", request.param)
+    return request.param
+
+
 @pytest.fixture()
 def rasm():
     """one atmospheric variable float64 with masked ocean"""
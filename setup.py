@@ -21,6 +21,7 @@ extras_require = {
     "prefect": ["prefect>=1.0.0,<2.0"],
     "io": ["netcdf4", "zarr"],
     "julia": ["julia"],
+    "numba": ["numba"],
 }
 extras_require["complete"] = sorted({v for req in extras_require.values() for v in req})
 extras_require["test"] = test_requirements
@@ -27,3 +27,4 @@ def LooseVersion(vstring):
 
 
 has_julia, requires_julia = _importorskip("julia")
+has_numba, requires_numba = _importorskip("numba")
@@ -1,3 +1,4 @@
+import dask
 import numpy as np
 import pytest
 import xarray as xr
@@ -11,7 +12,9 @@ from . import requires_julia
 
 
 @pytest.mark.parametrize("dtype", ["float16", "float32", "float64"])
-@pytest.mark.parametrize("implementation", ["xarray", "julia"])
+@pytest.mark.parametrize(
+    "implementation", ["xarray", pytest.param("julia", marks=requires_julia)]
+)
 @pytest.mark.parametrize("input_type", ["Dataset", "DataArray"])
 @pytest.mark.parametrize("keepbits", ["dict", "int"])
 def test_xr_bitround(air_temperature, dtype, input_type, implementation, keepbits):
@@ -26,8 +29,10 @@ def test_xr_bitround(air_temperature, dtype, input_type, implementation, keepbit
         v = list(ds.data_vars)[0]
         ds = ds[v]
 
-    bitround = xb.xr_bitround if implementation == "xarray" else xb.jl_bitround
-    ds_bitrounded = bitround(ds, keepbits)
+    if implementation == "xarray":
+        ds_bitrounded = xb.xr_bitround(ds, keepbits)
+    else:
+        ds_bitrounded = xb.jl_bitround(ds, keepbits, use_julia=True)
 
     def check(da, da_bitrounded):
         # check close
@@ -45,9 +50,30 @@ def test_xr_bitround(air_temperature, dtype, input_type, implementation, keepbit
             check(ds[v], ds_bitrounded[v])
 
 
+def test_xr_bitround_dataset_equals_dataarray(numba_installed):
+    """Test bitrounding a Dataset equals bitrounding each of its variables."""
+    rng = np.random.default_rng(42)
+    ds = xr.Dataset(
+        {
+            v: (("x", "y"), rng.standard_normal((10, 20)).astype(dtype))
+            for v, dtype in zip("abc", ["float16", "float32", "float64"])
+        }
+    )
+    keepbits = {"a": 2, "b": 7, "c": 20}
+    ds_bitrounded = xb.xr_bitround(ds, keepbits)
+    for v in ds.data_vars:
+        assert_equal(ds_bitrounded[v], xb.xr_bitround(ds[v], keepbits))
+
+
 @pytest.mark.parametrize(
     "implementation,dask",
-    [("xarray", True), ("xarray", False), ("julia", False)],
+    [
+        ("xarray", True),
+        ("xarray", False),
+        ("jl_bitround_default", True),
+        ("jl_bitround_default", False),
+        pytest.param("julia", False, marks=requires_julia),
+    ],
 )
 def test_bitround_dask(air_temperature, implementation, dask):
     """Test xr_bitround and jl_bitround keeps dask and successfully computes."""
@@ -57,13 +83,48 @@ def test_bitround_dask(air_temperature, implementation, dask):
     if dask:
         ds = ds.chunk("auto")
 
-    bitround = xb.xr_bitround if implementation == "xarray" else xb.jl_bitround
-    ds_bitrounded = bitround(ds, keepbits)
+    if implementation == "xarray":
+        ds_bitrounded = xb.xr_bitround(ds, keepbits)
+    elif implementation == "jl_bitround_default":
+        # python bitrounding, which supports dask
+        ds_bitrounded = xb.jl_bitround(ds, keepbits)
+    else:
+        ds_bitrounded = xb.jl_bitround(ds, keepbits, use_julia=True)
     assert is_dask_collection(ds_bitrounded) == dask
     if dask:
         assert ds_bitrounded.compute()
 
 
+def test_xr_bitround_dataset_mixed_chunks():
+    """Test xr_bitround on a Dataset with variables chunked differently or not at all."""
+    rng = np.random.default_rng(42)
+    ds = xr.Dataset({v: (("x", "y"), rng.standard_normal((20, 30))) for v in "abc"})
+    ds_mixed = ds.assign(a=ds.a.chunk({"x": 5}), b=ds.b.chunk({"x": 10}))
+    ds_bitrounded = xb.xr_bitround(ds_mixed, 3)
+    assert ds_bitrounded.a.chunks == ds_mixed.a.chunks
+    assert ds_bitrounded.b.chunks == ds_mixed.b.chunks
+    assert not is_dask_collection(ds_bitrounded.c)
+    assert_equal(ds_bitrounded.compute(), xb.xr_bitround(ds, 3))
+
+
+@pytest.mark.parametrize("input_type", ["Dataset", "DataArray"])
+def test_xr_bitround_dask_many_chunks(input_type, numba_installed):
+    """Test xr_bitround on many chunks bitrounded concurrently by the threaded dask scheduler."""
+    rng = np.random.default_rng(42)
+    ds = xr.Dataset(
+        {
+            "a": (("x", "y"), rng.standard_normal((400, 1000)).astype("float32")),
+            "b": (("x", "y"), rng.standard_normal((400, 1000))),
+        }
+    )
+    if input_type == "DataArray":
+        ds = ds["a"]
+    ds_bitrounded = xb.xr_bitround(ds.chunk({"x": 10}), 3)
+    with dask.config.set(scheduler="threads", num_workers=4):
+        ds_bitrounded = ds_bitrounded.compute()
+    assert_equal(ds_bitrounded, xb.xr_bitround(ds, 3))
+
+
 @requires_julia
 @pytest.mark.parametrize(
     "dtype,keepbits",
@@ -74,10 +135,111 @@ def test_bitround_xarray_julia_equal(air_temperature, dtype, keepbits):
     ds = air_temperature.astype(dtype)
     for keep in keepbits:
         ds_xr_bitrounded = xb.xr_bitround(ds, keep)
-        ds_jl_bitrounded = xb.jl_bitround(ds, keep)
+        ds_jl_bitrounded = xb.jl_bitround(ds, keep, use_julia=True)
         assert_equal(ds_jl_bitrounded, ds_xr_bitrounded)
 
 
+@pytest.mark.parametrize("use_julia", [False, pytest.param(True, marks=requires_julia)])
+@pytest.mark.parametrize("dtype", ["float16", "float32", "float64"])
+def test_jl_bitround_round_nearest_ties_to_even(dtype, use_julia):
+    """Test jl_bitround rounds to nearest with ties to even as BitInformation.jl.round."""
+    da = xr.DataArray(
+        np.array([1.5, 1.25, 1.75, 1.3, -1.75, 3.0, 0.0, np.inf], dtype=dtype),
+        name="x",
+    )
+    expected = {
+        0: [2.0, 1.0, 2.0, 1.0, -2.0, 2.0, 0.0, np.inf],
+        1: [1.5, 1.0, 2.0, 1.5, -2.0, 3.0, 0.0, np.inf],
+    }
+    for keep, values in expected.items():
+        da_bitrounded = xb.jl_bitround(da, keep, use_julia=use_julia)
+        np.testing.assert_array_equal(
+            da_bitrounded.values, np.array(values, dtype=dtype)
+        )
+
+
+@pytest.mark.parametrize("dtype", ["float16", "float32", "float64", ">f4"])
+def test_np_bitround_numcodecs_equal(dtype, numba_installed):
+    """Test _np_bitround and numcodecs.bitround yield identical results."""
+    from numcodecs.bitround import BitRound
+
+    rng = np.random.default_rng(42)
+    data = (rng.standard_normal((7, 11)) * 10.0 ** rng.integers(-4, 4, (7, 11))).astype(
+        dtype
+    )
+    data[0, :4] = [np.nan, np.inf, -np.inf, 0]
+    data_native = data.astype(data.dtype.newbyteorder("="))
+    for keep in range(np.finfo(dtype).nmant + 1):
+        codec = BitRound(keepbits=keep)
+        expected = codec.decode(codec.encode(data_native))
+        data_bitrounded = bi._np_bitround(data, keep)
+        assert data_bitrounded.dtype == data.dtype
+        np.testing.assert_array_equal(
+            data_bitrounded.astype(data_native.dtype).view(f"u{data.itemsize}"),
+            expected.view(f"u{data.itemsize}"),
+        )
+    # input not modified
+    assert not np.shares_memory(data, bi._np_bitround(data, 3))
+    with pytest.raises(ValueError):
+        bi._np_bitround(data, np.finfo(dtype).nmant + 1)
+
+
+def test_np_bitround_out(numba_installed):
+    """Test _np_bitround writes into out and bitrounds in place with out=data."""
+    data = np.random.default_rng(42).standard_normal((4, 5)).astype("float32")
+    expected = bi._np_bitround(data, 5)
+    assert not np.shares_memory(expected, data)
+    out = np.empty_like(data)
+    assert bi._np_bitround(data, 5, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+    # non-contiguous input
+    np.testing.assert_array_equal(bi._np_bitround(data.T, 5), expected.T)
+    # non-contiguous out
+    out = np.empty((4, 10), dtype=data.dtype)[:, ::2]
+    assert not out.flags.c_contiguous
+    assert bi._np_bitround(data, 5, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+    # in place
+    bi._np_bitround(data, 5, out=data)
+    np.testing.assert_array_equal(data, expected)
+
+
+@pytest.mark.parametrize("axis", [0, 1, 2])
+@pytest.mark.parametrize("dtype", ["float16", "float32", "float64"])
+def test_np_bitround_along_axis(dtype, axis, numba_installed):
+    """Test bitrounding with keepbits varying along an axis equals bitrounding each slice."""
+    rng = np.random.default_rng(42)
+    data = rng.standard_normal((6, 5, 6)).astype(dtype)
+    keepbits = np.array([np.finfo(dtype).nmant, 7, 7, 3, 0, 1])[: data.shape[axis]]
+    data_bitrounded = bi._np_bitround_along_axis(data, keepbits, axis)
+    for i, keep in enumerate(keepbits):
+        np.testing.assert_array_equal(
+            data_bitrounded.take(i, axis=axis),
+            bi._np_bitround(data.take(i, axis=axis), int(keep)),
+        )
+    np.testing.assert_array_equal(
+        data_bitrounded.take(0, axis=axis), data.take(0, axis=axis)
+    )
+    # non-contiguous out
+    out = np.empty(data.shape + (2,), dtype=data.dtype)[..., 0]
+    bi._np_bitround_along_axis(data, keepbits, axis, out=out)
+    np.testing.assert_array_equal(out, data_bitrounded)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "float32", "float64"])
+def test_np_bitround_parallel(dtype, numba_installed):
+    """Test bitrounding on all cores equals bitrounding in serial."""
+    data = np.random.default_rng(42).standard_normal((6, 5, 4)).astype(dtype)
+    np.testing.assert_array_equal(
+        bi._np_bitround(data, 3, parallel=True), bi._np_bitround(data, 3)
+    )
+    keepbits = np.array([np.finfo(dtype).nmant, 7, 3, 0, 1])
+    np.testing.assert_array_equal(
+        bi._np_bitround_along_axis(data, keepbits, 1, parallel=True),
+        bi._np_bitround_along_axis(data, keepbits, 1),
+    )
+
+
 def test_bitround_along_dim(air_temperature):
     # test for inflevels
     ds = air_temperature
@@ -120,3 +282,17 @@ def test_bitround_along_dim(air_temperature):
     # Test error when neither keepbits nor inflevels are provided
     with pytest.raises(ValueError):
         bi.bitround_along_dim(ds, info_per_bit, dim="lat", inflevels=None)
+
+
+@pytest.mark.parametrize("dim", ["time", "lat", "lon"])
+def test_bitround_along_dim_dask_many_chunks(air_temperature, dim, numba_installed):
+    """Test bitround_along_dim on many chunks bitrounded concurrently by the threaded dask scheduler."""
+    ds = air_temperature
+    info_per_bit = xb.get_bitinformation(ds, dim="lon", implementation="python")
+    ds_bitrounded = bi.bitround_along_dim(
+        ds.chunk({"time": 7, "lat": 6, "lon": 11}), info_per_bit, dim=dim
+    )
+    assert is_dask_collection(ds_bitrounded)
+    with dask.config.set(scheduler="threads", num_workers=4):
+        ds_bitrounded = ds_bitrounded.compute()
+    assert_equal(ds_bitrounded, bi.bitround_along_dim(ds, info_per_bit, dim=dim))
@@ -0,0 +1,149 @@
+"""Numba kernels for bitrounding. Used in :py:func:`xbitinfo.bitround._np_bitround` if ``numba`` is installed."""
+
+from functools import partial
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(nogil=True, cache=True)
+def _bitround_uint(ai, ao, drop, half, mask):
+    """Round-to-nearest-ties-to-even of the unsigned integer view ``ai`` of a float array into ``ao``.
+
+    ``half`` is one less than half a unit in the last kept place; together with the
+    last kept bit as tie-breaker this rounds ties to even like ``numcodecs.bitround``
+    and ``BitInformation.jl``. ``ao`` may be ``ai`` to bitround in place.
+    Serial and releasing the GIL, so dask or a thread pool can call it concurrently on blocks.
+    """
+    for i in range(ai.size):
+        x = ai[i]
+        ao[i] = (x + half + ((x >> drop) & 1)) & mask
+
+
+@njit(parallel=True, cache=True)
+def _bitround_uint_parallel(ai, ao, drop, half, mask):
+    """Like :py:func:`_bitround_uint` on all cores. Must not be called from several threads at once."""
+    for i in prange(ai.size):
+        x = ai[i]
+        ao[i] = (x + half + ((x >> drop) & 1)) & mask
+
+
+@njit(nogil=True, cache=True)
+def _bitround_uint_along_axis(ai, ao, drop, half, mask, tie):
+    """Like :py:func:`_bitround_uint` with constants varying along the middle axis of 3D ``ai``."""
+    for i in range(ai.shape[0]):
+        for j in range(ai.shape[1]):
+            for k in range(ai.shape[2]):
+                x = ai[i, j, k]
+                ao[i, j, k] = (x + half[j] + ((x >> drop[j]) & tie[j])) & mask[j]
+
+
+@njit(parallel=True, cache=True)
+def _bitround_uint_along_axis_parallel(ai, ao, drop, half, mask, tie):
+    """Like :py:func:`_bitround_uint_along_axis` on all cores. Must not be called from several threads at once."""
+    n = ai.shape[1]
+    for ij in prange(ai.shape[0] * n):
+        i = ij // n
+        j = ij - i * n
+        for k in range(ai.shape[2]):
+            x = ai[i, j, k]
+            ao[i, j, k] = (x + half[j] + ((x >> drop[j]) & tie[j])) & mask[j]
+
+
+def _check_out(a, out):
+    """Return C-contiguous ``a`` and ``out`` of same shape and dtype, new if ``None``."""
+    a = np.ascontiguousarray(a)
+    if out is None:
+        return a, np.empty_like(a)
+    if out.shape != a.shape or out.dtype != a.dtype:
+        raise ValueError("out must have the same shape and dtype as the input")
+    return a, out
+
+
+def _bitround(a, keep, out, uint, parallel=False):
+    """Bitround float array ``a`` into ``out`` keeping ``keep`` mantissa bits, on all cores if ``parallel``."""
+    nmant = np.finfo(a.dtype).nmant
+    if keep < 0:
+        raise ValueError("keepbits must be zero or positive")
+    if keep > nmant:
+        raise ValueError("Keepbits too large for given dtype")
+    a, out = _check_out(a, out)
+    if not out.flags.c_contiguous:
+        # the kernel needs contiguous memory, write through a temporary
+        out[...] = _bitround(a, keep, None, uint, parallel)
+        return out
+    if keep == nmant:
+        out[...] = a
+        return out
+    drop = nmant - keep
+    half = uint((1 << (drop - 1)) - 1)
+    mask = ~uint((1 << drop) - 1)
+    kernel = _bitround_uint_parallel if parallel else _bitround_uint
+    kernel(a.reshape(-1).view(uint), out.reshape(-1).view(uint), uint(drop), half, mask)
+    return out
+
+
+def _bitround_along_axis(a, keeps, axis, out, uint, parallel=False):
+    """Bitround float array ``a`` into ``out`` keeping ``keeps`` mantissa bits along ``axis``, on all cores if ``parallel``."""
+    nmant = np.finfo(a.dtype).nmant
+    keeps = np.broadcast_to(keeps, a.shape[axis : axis + 1])
+    if (keeps < 0).any():
+        raise ValueError("keepbits must be zero or positive")
+    if (keeps > nmant).any():
+        raise ValueError("Keepbits too large for given dtype")
+    a, out = _check_out(a, out)
+    if not out.flags.c_contiguous:
+        # the kernel needs contiguous memory, write through a temporary
+        out[...] = _bitround_along_axis(a, keeps, axis, None, uint, parallel)
+        return out
+    one = uint(1)
+    drop = (nmant - keeps).astype(uint)
+    tie = (drop > 0).astype(uint)  # no tie-breaking where all bits are kept
+    half = (((one << drop) >> one) - tie).astype(uint)
+    mask = (~((one << drop) - one)).astype(uint)
+    shape = (
+        int(np.prod(a.shape[:axis])),
+        a.shape[axis],
+        int(np.prod(a.shape[axis + 1 :])),
+    )
+    kernel = (
+        _bitround_uint_along_axis_parallel if parallel else _bitround_uint_along_axis
+    )
+    kernel(
+        a.reshape(shape).view(uint),
+        out.reshape(shape).view(uint),
+        drop,
+        half,
+        mask,
+        tie,
+    )
+    return out
+
+
+def bitround_f16(a, keep, out=None, parallel=False):
+    """Bitround float16 array ``a`` keeping ``keep`` of 10 mantissa bits."""
+    return _bitround(a, keep, out, np.uint16, parallel)
+
+
+def bitround_f32(a, keep, out=None, parallel=False):
+    """Bitround float32 array ``a`` keeping ``keep`` of 23 mantissa bits."""
+    return _bitround(a, keep, out, np.uint32, parallel)
+
+
+def bitround_f64(a, keep, out=None, parallel=False):
+    """Bitround float64 array ``a`` keeping ``keep`` of 52 mantissa bits."""
+    return _bitround(a, keep, out, np.uint64, parallel)
+
+
+bitround_kernels = {
+    np.dtype("float16"): bitround_f16,
+    np.dtype("float32"): bitround_f32,
+    np.dtype("float64"): bitround_f64,
+}
+
+
+bitround_along_axis_kernels = {
+    np.dtype("float16"): partial(_bitround_along_axis, uint=np.uint16),
+    np.dtype("float32"): partial(_bitround_along_axis, uint=np.uint32),
+    np.dtype("float64"): partial(_bitround_along_axis, uint=np.uint64),
+}
@@ -1,15 +1,92 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
 import xarray as xr
-from numcodecs.bitround import BitRound
+from dask import is_dask_collection
 
 from .xbitinfo import _jl_bitround, get_keepbits
 
+try:
+    from ._numba_bitround import bitround_along_axis_kernels, bitround_kernels
+
+    numba_installed = True
+except ImportError:
+    numba_installed = False
+
+
+def _np_bitround(data, keepbits, out=None, parallel=False):
+    """Bitround for Arrays.
+
+    Writes into ``out`` if given (``out=data`` bitrounds in place), otherwise into a new array.
+    ``parallel`` uses all cores with ``numba``; not for dask blocks or other concurrent calls.
+    """
+    if numba_installed and data.dtype in bitround_kernels:
+        return bitround_kernels[data.dtype](data, keepbits, out=out, parallel=parallel)
+    if data.dtype.kind != "f":
+        raise TypeError("Only float arrays (16-64bit) can be bit-rounded")
+    nmant = np.finfo(data.dtype).nmant
+    if keepbits < 0:
+        raise ValueError("keepbits must be zero or positive")
+    if keepbits > nmant:
+        raise ValueError("Keepbits too large for given dtype")
+    if out is None:
+        out = np.empty_like(data)  # otherwise overwrites the input
+    if keepbits == nmant:
+        np.copyto(out, data)
+        return out
+    # unsigned integer view of same width and endianness
+    uint = data.dtype.str.replace("f", "u")
+    ai, ao = data.view(uint), out.view(uint)
+    utype = ao.dtype.type
+    drop = nmant - keepbits
+    half = utype((1 << (drop - 1)) - 1)
+    mask = ~utype((1 << drop) - 1)
+    tie = np.right_shift(ai, utype(drop))
+    np.bitwise_and(tie, utype(1), out=tie)
+    np.add(ai, half, out=ao)
+    np.add(ao, tie, out=ao)
+    np.bitwise_and(ao, mask, out=ao)
+    return out
+
+
+def _np_bitround_along_axis(data, keepbits, axis, out=None, parallel=False):
+    """Bitround for Arrays with ``keepbits`` varying along ``axis``.
+
+    ``keepbits`` holds one value per element along ``axis`` and may carry singleton
+    dimensions as broadcast by :py:func:`xarray.apply_ufunc`.
+    Writes into ``out`` if given (``out=data`` bitrounds in place), otherwise into a new array.
+    ``parallel`` uses all cores with ``numba``; not for dask blocks or other concurrent calls.
+    """
+    keepbits = np.ravel(keepbits)
+    if numba_installed and data.dtype in bitround_along_axis_kernels:
+        return bitround_along_axis_kernels[data.dtype](
+            data, keepbits, axis, out=out, parallel=parallel
+        )
+    if out is None:
+        out = np.empty_like(data, order="C")  # otherwise overwrites the input
+    keepbits = np.broadcast_to(keepbits, data.shape[axis : axis + 1])
+    for keep in np.unique(keepbits):
+        index = (slice(None),) * axis + (keepbits == keep,)
+        out[index] = _np_bitround(data[index], int(keep))
+    return out
+
 
-def _np_bitround(data, keepbits):
-    """Bitround for Arrays."""
-    codec = BitRound(keepbits=keepbits)
-    data = data.copy()  # otherwise overwrites the input
-    encoded = codec.encode(data)
-    return codec.decode(encoded)
+def _bitround_dataset(ds, keeps, bitround, mapper=map):
+    """Bitround all variables in ``keeps`` of an in-memory :py:class:`xarray.Dataset` with ``bitround``.
+
+    ``mapper`` applies ``bitround`` to the variables, e.g. ``executor.map`` of a thread pool.
+    """
+    data = mapper(lambda v: bitround(ds[v].values, keeps[v]), keeps)
+    return ds.assign({v: ds[v].variable.copy(data=d) for v, d in zip(keeps, data)})
+
+
+def _set_keepbits_attrs(ds, keeps):
+    """Set ``_QuantizeBitRoundNumberOfSignificantDigits`` of all variables in ``keeps``."""
+    for v, keep in keeps.items():
+        ds[v].attrs["_QuantizeBitRoundNumberOfSignificantDigits"] = keep
+    return ds
 
 
 def _keepbits_interface(da, keepbits):
@@ -46,7 +123,7 @@ def _keepbits_interface(da, keepbits):
             ), "Information content is only allowed along one dimension here. Please select one `dim`. To find the maximum keepbits, simply use `keepbits.max(dim='dim')`"
         v = da.name
         if v in keepbits.keys():
-            keep = int(keepbits[v])
+            keep = int(keepbits[v].item())
         else:
             raise ValueError(f"name {v} not for in keepbits: {keepbits.keys()}")
     elif isinstance(keepbits, xr.DataArray):
@@ -58,7 +135,7 @@ def _keepbits_interface(da, keepbits):
         ), "Information content is only allowed along one dimension here. Please select one `dim`. To find the maximum keepbits, simply use `keepbits.max(dim='dim')`"
         v = da.name
         if v == keepbits.name:
-            keep = int(keepbits)
+            keep = int(keepbits.item())
         else:
             raise KeyError(f"no keepbits found for variable {v}")
     else:
@@ -66,8 +143,39 @@ def _keepbits_interface(da, keepbits):
     return keep
 
 
+def _resolve_keepbits(ds, keepbits):
+    """Resolve ``keepbits`` once for all data variables of ``ds``
+
+    Parameters
+    ----------
+    ds : :py:class:`xarray.Dataset`
+      Input data to bitround
+    keepbits : int, dict of {str: int}, :py:class:`xarray.DataArray` or :py:class:`xarray.Dataset`
+      How many bits to keep as int
+
+    Returns
+    -------
+    keeps : dict of {str: int}
+      Number of keepbits per data variable, passed down as plain ints to the blockwise bitrounding
+    """
+    return {v: _keepbits_interface(ds[v], keepbits) for v in ds.data_vars}
+
+
+def _bitround_dataarray(da, keep):
+    """Bitround :py:class:`xarray.DataArray` keeping ``keep`` mantissa bits, blockwise if ``da`` is chunked."""
+    return xr.apply_ufunc(
+        _np_bitround,
+        da,
+        # dask supplies the parallelism for chunked data
+        kwargs={"keepbits": keep, "parallel": not is_dask_collection(da)},
+        dask="parallelized",
+        output_dtypes=[da.dtype],
+        keep_attrs=True,
+    )
+
+
 def xr_bitround(da, keepbits):
-    """Apply bitrounding based on keepbits from :py:func:`xbitinfo.xbitinfo.get_keepbits` for :py:class:`xarray.Dataset` or :py:class:`xarray.DataArray` wrapping ``numcodecs.bitround``
+    """Apply bitrounding based on keepbits from :py:func:`xbitinfo.xbitinfo.get_keepbits` for :py:class:`xarray.Dataset` or :py:class:`xarray.DataArray` rounding to nearest with ties to even as ``numcodecs.bitround``
 
     Parameters
     ----------
@@ -88,21 +196,35 @@ def xr_bitround(da, keepbits):
     >>> ds_bitrounded = xb.xr_bitround(ds, keepbits)
     """
     if isinstance(da, xr.Dataset):
-        da_bitrounded = da.copy()
-        for v in da.data_vars:
-            da_bitrounded[v] = xr_bitround(da[v], keepbits)
-        return da_bitrounded
+        keeps = _resolve_keepbits(da, keepbits)
+        if is_dask_collection(da):
+            # per variable, so variables may be chunked differently or not at all
+            da_bitrounded = da.assign(
+                {v: _bitround_dataarray(da[v], keep) for v, keep in keeps.items()}
+            )
+        elif len(keeps) <= 1:
+            # a single variable is bitrounded on all cores
+            da_bitrounded = _bitround_dataset(
+                da, keeps, partial(_np_bitround, parallel=True)
+            )
+        else:
+            # both the numba kernels and the numpy ufuncs release the GIL
+            max_workers = min(len(keeps), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                da_bitrounded = _bitround_dataset(
+                    da, keeps, _np_bitround, mapper=executor.map
+                )
+        return _set_keepbits_attrs(da_bitrounded, keeps)
 
     assert isinstance(da, xr.DataArray)
     keep = _keepbits_interface(da, keepbits)
-
-    da = xr.apply_ufunc(_np_bitround, da, keep, dask="parallelized", keep_attrs=True)
+    da = _bitround_dataarray(da, keep)
     da.attrs["_QuantizeBitRoundNumberOfSignificantDigits"] = keep
     return da
 
 
-def jl_bitround(da, keepbits):
-    """Apply bitrounding based on keepbits from :py:func:`xbitinfo.xbitinfo.get_keepbits` for :py:class:`xarray.Dataset` or :py:class:`xarray.DataArray` wrapping `BitInformation.jl.round <https://github.com/milankl/BitInformation.jl/blob/main/src/round_nearest.jl>`__.
+def jl_bitround(da, keepbits, use_julia=False):
+    """Apply bitrounding based on keepbits from :py:func:`xbitinfo.xbitinfo.get_keepbits` for :py:class:`xarray.Dataset` or :py:class:`xarray.DataArray` as `BitInformation.jl.round <https://github.com/milankl/BitInformation.jl/blob/main/src/round_nearest.jl>`__.
 
     Parameters
     ----------
@@ -110,6 +232,10 @@ def jl_bitround(da, keepbits):
       Input data to bitround
     keepbits : int, dict of {str: int}, :py:class:`xarray.DataArray` or :py:class:`xarray.Dataset`
       How many bits to keep as int. Fails if dict or :py:class:`xarray.Dataset` and key or variable not present.
+    use_julia : bool
+      Call ``BitInformation.jl.round`` via julia, which requires the full data in memory.
+      If ``False``, use the compiled python implementation of :py:func:`xbitinfo.bitround.xr_bitround`,
+      which rounds bit-identically to nearest with ties to even and supports dask. Defaults to ``False``.
 
     Returns
     -------
@@ -122,19 +248,44 @@ def jl_bitround(da, keepbits):
     >>> keepbits = xb.get_keepbits(info_per_bit, 0.99)
     >>> ds_bitrounded = xb.jl_bitround(ds, keepbits)
     """
+    if not use_julia:
+        return xr_bitround(da, keepbits)
+
     if isinstance(da, xr.Dataset):
-        da_bitrounded = da.copy()
-        for v in da.data_vars:
-            da_bitrounded[v] = jl_bitround(da[v], keepbits)
-        return da_bitrounded
+        if is_dask_collection(da):
+            raise ValueError(
+                "jl_bitround does not support dask arrays. Please load the data or use xr_bitround."
+            )
+        keeps = _resolve_keepbits(da, keepbits)
+        da_bitrounded = _bitround_dataset(da, keeps, _jl_bitround)
+        return _set_keepbits_attrs(da_bitrounded, keeps)
 
     assert isinstance(da, xr.DataArray)
     keep = _keepbits_interface(da, keepbits)
-    da = xr.apply_ufunc(_jl_bitround, da, keep, dask="forbidden", keep_attrs=True)
+    da = xr.apply_ufunc(
+        _jl_bitround, da, kwargs={"keepbits": keep}, dask="forbidden", keep_attrs=True
+    )
     da.attrs["_QuantizeBitRoundNumberOfSignificantDigits"] = keep
     return da
 
 
+def _bitround_along_dim(da, keeps, dim):
+    """Bitround :py:class:`xarray.DataArray` with ``keeps`` varying along ``dim``.
+
+    ``keeps`` is broadcast against ``da`` block by block, so dask arrays keep their
+    chunks and the bitrounding stays a single blockwise task per chunk.
+    """
+    return xr.apply_ufunc(
+        _np_bitround_along_axis,
+        da,
+        keeps,
+        kwargs={"axis": da.get_axis_num(dim), "parallel": not is_dask_collection(da)},
+        dask="parallelized",
+        output_dtypes=[da.dtype],
+        keep_attrs=True,
+    )
+
+
 def bitround_along_dim(
     ds, info_per_bit, dim, inflevels=[1.0, 0.9999, 0.99, 0.975, 0.95], keepbits=None
 ):
@@ -180,28 +331,40 @@ def bitround_along_dim(
     <matplotlib.collections.QuadMesh object at ...>
 
     """
-    new_ds = []
     if inflevels is not None and keepbits is not None:
         raise ValueError("Either inflevel or keepbits should be None")
-    elif inflevels is not None:
-        stride = ds[dim].size // len(inflevels)
-        for i, inf in enumerate(inflevels):  # last slice might be a bit larger
-            ds_slice = ds.isel(
-                {
-                    dim: slice(
-                        stride * i,
-                        stride * (i + 1) if i != len(inflevels) - 1 else None,
-                    )
-                }
-            )
-            keepbits_slice = get_keepbits(info_per_bit, inf)
-            if inf != 1:
-                ds_slice_bitrounded = xr_bitround(ds_slice, keepbits_slice)
-            else:
-                ds_slice_bitrounded = ds_slice
-            new_ds.append(ds_slice_bitrounded)
     elif keepbits is not None:
-        new_ds = [xr_bitround(ds, keepbits)]
-    else:
+        return xr_bitround(ds, keepbits)
+    elif inflevels is None:
         raise ValueError("Either inflevel or keepbits should NOT be None")
-    return xr.concat(new_ds, dim)
+
+    stride = ds[dim].size // len(inflevels)
+    # last slice might be a bit larger
+    stride_sizes = [stride] * (len(inflevels) - 1)
+    stride_sizes.append(ds[dim].size - sum(stride_sizes))
+
+    # keepbits of all variables once per inflevel, no bitrounding for inflevel 1
+    keepbits_per_inflevel = [
+        None if inf == 1 else get_keepbits(info_per_bit, inf) for inf in inflevels
+    ]
+
+    def _keeps_along_dim(da):
+        keeps = [
+            (
+                np.finfo(da.dtype).nmant
+                if keepbits is None
+                else _keepbits_interface(da, keepbits)
+            )
+            for keepbits in keepbits_per_inflevel
+        ]
+        return xr.DataArray(np.repeat(keeps, stride_sizes), dims=[dim])
+
+    if isinstance(ds, xr.DataArray):
+        return _bitround_along_dim(ds, _keeps_along_dim(ds), dim)
+    return ds.assign(
+        {
+            v: _bitround_along_dim(ds[v], _keeps_along_dim(ds[v]), dim)
+            for v in ds.data_vars
+            if dim in ds[v].dims
+        }
+    )
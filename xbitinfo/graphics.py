@@ -1,3 +1,4 @@
+import dask.array
 import matplotlib.cm as cm
 import numpy as np
 import xarray as xr
@@ -274,18 +275,15 @@ def plot_bitinformation(bitinfo, information_filter=None, cmap="turku", crop=Non
             infbits_dict = get_keepbits(bitinfo, 0.99)
             infbits100_dict = get_keepbits(bitinfo, 0.999999999)
 
-        ICnan = np.zeros((nvars, 64))
-        infbits = np.zeros(nvars)
-        infbits100 = np.zeros(nvars)
-        ICnan[:, :] = np.nan
-        for v, var in enumerate(varnames):
-            ic = bitinfo[var].squeeze(drop=True)
-            ICnan[v, : len(ic)] = ic
-            # infbits are all bits, infbits_dict were mantissa bits
-            infbits[v] = infbits_dict[var] + nonmantissa_bits
-            infbits100[v] = infbits100_dict[var] + nonmantissa_bits
+        ICnan = np.full((nvars, 64), np.nan)
+        ICnan[:, :n_bits] = bitinfo.to_array().transpose("variable", dim).values
+        # infbits are all bits, infbits_dict were mantissa bits
+        infbits = infbits_dict[varnames].to_array().values.reshape(nvars)
+        infbits = infbits + nonmantissa_bits
+        infbits100 = infbits100_dict[varnames].to_array().values.reshape(nvars)
+        infbits100 = infbits100 + nonmantissa_bits
         ICnan = np.where(ICnan == 0, np.nan, ICnan)
-        ICcsum = np.nancumsum(ICnan, axis=1)
+        ICsum = np.nansum(ICnan, axis=1)  # total information per variable
 
         infbitsy = np.hstack([0, np.repeat(np.arange(1, nvars), 2), nvars])
         infbitsx = np.repeat(infbits, 2)
@@ -297,8 +295,9 @@ def plot_bitinformation(bitinfo, information_filter=None, cmap="turku", crop=Non
         subfigure_data[d]["fig_height"] = fig_height
         subfigure_data[d]["nvars"] = nvars
         subfigure_data[d]["varnames"] = varnames
-        subfigure_data[d]["ICnan"] = ICnan
-        subfigure_data[d]["ICcsum"] = ICcsum
+        # only rendered into a colormap, float16 precision is sufficient
+        subfigure_data[d]["ICnan"] = ICnan.astype(np.float16)
+        subfigure_data[d]["ICsum"] = ICsum
         subfigure_data[d]["infbits"] = infbits
         subfigure_data[d]["infbitsx"] = infbitsx
         subfigure_data[d]["infbitsy"] = infbitsy
@@ -340,7 +339,7 @@ def plot_bitinformation(bitinfo, information_filter=None, cmap="turku", crop=Non
         infbits = subfig["infbits"]
         nvars = subfig["nvars"]
         n_sign, n_exp, n_bits, n_mant, nonmantissa_bits = subfig["nbits"]
-        ICcsum = subfig["ICcsum"]
+        ICsum = subfig["ICsum"]
         ICnan = subfig["ICnan"]
         infbitsy = subfig["infbitsy"]
         infbitsx = subfig["infbitsx"]
@@ -432,24 +431,15 @@ def plot_bitinformation(bitinfo, information_filter=None, cmap="turku", crop=Non
         axs[d].set_yticks(np.arange(nvars) + 0.5)
         ax1right.set_yticks(np.arange(nvars) + 0.5)
         axs[d].set_yticklabels(varnames)
-        ax1right.set_yticklabels([f"{i:4.1f}" for i in ICcsum[:, -1]])
+        ax1right.set_yticklabels([f"{i:4.1f}" for i in ICsum])
         if d == len(subfigure_data) // 2:
             ax1right.set_ylabel("total information\nper value [bit]")
 
-        axs[d].text(
-            infbits[0] + 0.1,
-            0.8,
-            f"{int(infbits[0]-nonmantissa_bits)} mantissa bits",
-            fontsize=8,
-            color="saddlebrown",
-        )
-        for i in range(1, nvars):
+        mantissa_labels = [f"{int(i)}" for i in infbits - nonmantissa_bits]
+        mantissa_labels[0] += " mantissa bits"
+        for i, label in enumerate(mantissa_labels):
             axs[d].text(
-                infbits[i] + 0.1,
-                (i) + 0.8,
-                f"{int(infbits[i]-9)}",
-                fontsize=8,
-                color="saddlebrown",
+                infbits[i] + 0.1, i + 0.8, label, fontsize=8, color="saddlebrown"
             )
 
         major_xticks = np.array([n_sign, n_sign + n_exp, n_bits], dtype="int")
@@ -485,21 +475,19 @@ def plot_bitinformation(bitinfo, information_filter=None, cmap="turku", crop=Non
         )
 
         # Set xticklabels
-        ## Set exponent labels
-        for e, i in enumerate(range(n_sign, np.min([n_sign + n_exp, bits_to_show]))):
+        ## Set exponent and mantissa labels
+        bits = np.arange(n_sign, bits_to_show)
+        is_exp = bits < n_sign + n_exp
+        bit_labels = np.where(is_exp, bits - n_sign + 1, bits - n_sign - n_exp + 1)
+        for i, label, exp in zip(bits, bit_labels, is_exp):
             axs[d].text(
                 i + 0.5,
                 nvars + 0.5,
-                e + 1,
+                label,
                 ha="center",
                 fontsize=7,
-                color="darkslategrey",
+                color="darkslategrey" if exp else None,  # default text color
             )
-        ## Set mantissa labels
-        for m, i in enumerate(
-            range(n_sign + n_exp, np.min([n_sign + n_exp + n_mant, bits_to_show]))
-        ):
-            axs[d].text(i + 0.5, nvars + 0.5, m + 1, ha="center", fontsize=7)
 
         if d == len(subfigure_data) - 1:
             lax.legend(
@@ -559,7 +547,7 @@ def plot_distribution(ds, nbins=1000, cmap="viridis", offset=0.01, close_zero=1e
     varnames = list(ds.data_vars)
     nvars = len(varnames)
     ds = ds[varnames].squeeze()
-    gmin, gmax = ds.to_array().min(), ds.to_array().max()
+    gmin, gmax = float(ds.min().to_array().min()), float(ds.max().to_array().max())
     f = 2  # factor for bounds
     if gmin < 0 and gmax > 0:
         bins_neg = np.geomspace(gmin * f, -close_zero, nbins // 2 + 1, dtype=float)
@@ -568,12 +556,13 @@ def plot_distribution(ds, nbins=1000, cmap="viridis", offset=0.01, close_zero=1e
     else:
         bins = np.geomspace(gmin / f, gmax * f, nbins + 1, dtype=float)
 
-    H = np.zeros((nvars, nbins))
-    for i, v in enumerate(varnames):
-        d = ds[v].data.flatten()
-        d = d[~np.isnan(d)]  # drop NaN
-        H[i, :], _ = np.histogram(d, bins=bins, density=True)
-        H[i, :] = H[i, :] / np.sum(H[i, :])  # normalize
+    # NaNs fall outside the explicit bins and are not counted
+    counts = [
+        dask.array.histogram(dask.array.asarray(ds[v].data), bins=bins)[0]
+        for v in varnames
+    ]
+    H = dask.array.stack(counts).compute() / np.diff(bins)  # density
+    H = H / H.sum(axis=1, keepdims=True)  # normalize
 
     fig, ax = plt.subplots(1, 1, figsize=(5, 2 + nvars / 10))
     colors = cm.get_cmap(cmap, nvars).colors
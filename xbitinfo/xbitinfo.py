@@ -825,8 +825,10 @@ def get_prefect_flow(paths=[]):
         ds = xr.open_dataset(path, chunks=chunks)
         if enforce_dtype:
             ds = ds.astype(enforce_dtype)
-        bitround_func = jl_bitround if bitround_in_julia else xr_bitround
-        ds_bitround = bitround_func(ds, keepbits)
+        if bitround_in_julia:
+            ds_bitround = jl_bitround(ds, keepbits, use_julia=True)
+        else:
+            ds_bitround = xr_bitround(ds, keepbits)
         ds_bitround.to_compressed_netcdf(new_path, complevel=complevel)
         return
 